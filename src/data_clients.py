@@ -5,12 +5,41 @@ file.
 . The WriteData will be the client of FileGeneratorFactory.
 . The ProcessData will be the client of FileReaderFactory.
 """
-from collections.abc import Iterator
-from itertools import zip_longest
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from heapq import merge
+from pickle import HIGHEST_PROTOCOL, dump, load
+from sys import getsizeof, intern
+from tempfile import TemporaryFile
+from typing import BinaryIO
 
 from file_generators import FileGeneratorFactory
-from file_readers import FileReaderFactory
-from functions import sort_alphanumeric, create_result_directory, order_record
+from file_readers import FileReader, FileReaderFactory
+from functions import sort_alphanumeric, create_result_directory, compute_alnum_permutation
+
+
+def record_key(record: list) -> tuple[tuple[int, int, int | float | str], ...]:
+    """Return the key to sort a record by its first three data: D1-D3.
+
+    Parameters
+    ----------
+    record: list
+        The completed record.
+
+    Returns
+    -------
+    tuple[tuple[int, int, int | float | str], ...]
+        For each of the first three data: missing data (None) goes
+        last, and numbers go before text.
+
+    Notes
+    -----
+    The key is a total order, so any two records can be compared: in
+    a sort or between the sorted runs of a merge.
+    """
+    return tuple(
+        (1, 0, '') if data is None else (0, 1, data) if isinstance(data, str) else (0, 0, data)
+        for data in record[:3])
 
 
 class WriteData:
@@ -57,6 +86,18 @@ class WriteData:
         """Write the data in the file."""
         self._file_generator.set_data(data)
 
+    def close(self) -> None:
+        """Close the output file once all the data has been written."""
+        self._file_generator.close()
+
+    def __enter__(self) -> 'WriteData':
+        """Use the writer as context manager, closing it at exit."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the output file when the context ends."""
+        self.close()
+
     def __str__(self) -> str:
         """Return the path and name of the aoutput file."""
         return str(self._file_generator)
@@ -80,13 +121,22 @@ class ProcessData:
     file_processing_data: dict[str, dict]
         Metadata of the readed files.
         The keys will be the name of each file. Whilst the values are
-        other dicts with two keys:
+        other dicts with four keys:
         . header_comparison: tuple[int] - set of boolean values, flags,
         result of compare the headers file against gathered headers in
         attribute 'headers'.
         . rearrangement_needed: bool - True if the headers is file are
         not ordered,so the records from it must be ordered; False
         otherwise.
+        . perm: tuple[int] - for each header in alphanumeric order, its
+        position in the file: the permutation that orders a record.
+        . dest_indices: tuple[int] - for each data of an ordered record
+        of the file, its position in the attribute 'headers'.
+    buffer_limit: int
+        Estimated size in bytes of the records kept in memory before
+        they are sorted and saved in a temporary file.
+    run_batch_size: int
+        Number of records serialized together in the temporary files.
 
     Notes
     -----
@@ -94,14 +144,28 @@ class ProcessData:
     obtained through generators.
     """
 
+    buffer_limit: int = 512 * (1 << 20)  # 512 MB
+    run_batch_size: int = 4096
+
     def __init__(self, path: str) -> None:
         """Initialize the attributes of the class."""
+        self._path: str = path
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear the data of a previous processing, so the instance
+
+        can be reused to process the files again.
+        """
         self.headers: list[str] = []
         self.file_processing_data: dict[str, dict] = {}
 
-        self._path: str = path
         self._file_names: list[str] = []
-        self._headers_by_file: tuple[list] = ()
+        self._headers_by_file: list[list[str]] = []
+        # Same data of 'file_processing_data', indexed by file position
+        self._rearrangement_needed: list[bool] = []
+        self._permutations: list[tuple[int]] = []
+        self._dest_indices: list[tuple[int]] = []
 
     def get_headers(self) -> list[str]:
         """Return the value of the attribute 'headers'.
@@ -130,6 +194,7 @@ class ProcessData:
             The tuple of file lists to process.
         """
         factory: type[FileReaderFactory] = FileReaderFactory()
+        file_readers: list[type[FileReader]] = []
 
         for files_by_extension in files:
             for file in files_by_extension:
@@ -139,8 +204,15 @@ class ProcessData:
                     print(f'Error: {no_registered.args[0]}')
                 else:
                     self.save_file_name(file)
-                    file_reader.get_headers()  # Get the headers of the file
-                    self._headers_by_file = (*self._headers_by_file, file_reader.headers)
+                    file_readers.append(file_reader)
+
+        if not file_readers:
+            return None
+        # Get the headers of the files at the same time (overlap the IO
+        # waits), 'map' keeps the order of the files.
+        with ThreadPoolExecutor(max_workers=min(32, len(file_readers))) as executor:
+            for file_reader, _ in zip(file_readers, executor.map(lambda reader: reader.get_headers(), file_readers)):
+                self._headers_by_file.append(file_reader.headers)
 
     def sort_headers(self) -> None:
         """Sort the headers of the files avoiding add duplicates.
@@ -170,106 +242,177 @@ class ProcessData:
                 if header not in set_headers:
                     set_headers.add(header)
 
-        self.headers = sort_alphanumeric(list(set_headers))
+        self.headers = [intern(header) for header in sort_alphanumeric(list(set_headers))]
 
     def make_file_processing_data(self) -> None:
         """Fill the attribute class with the information from the
 
         comparison of the headers file against the set of headers
         gathered (headers attribute).
-        Each position of 'header_comparison' will work as flag.
+        Each position of 'header_comparison' will work as flag, 'perm'
+        orders the records of the file, and 'dest_indices' maps the
+        data of the (ordered) records of the file to its position in
+        the completed record.
         """
+        header_positions: dict[str, int] = {header: position for position, header in enumerate(self.headers)}
+
         for file_name, file_headers in zip(self._file_names, self._headers_by_file):
-            headers_list: list[int] = []
-            for header in self.headers:
-                if header in file_headers:
-                    headers_list.append(True)
-                else:
-                    headers_list.append(False)
+            file_headers_set: set[str] = set(file_headers)
+            perm: tuple[int] = compute_alnum_permutation(file_headers)
             self.file_processing_data[file_name] = {
-                'header_comparison': tuple(headers_list),
-                'rearrangement_needed': file_headers != sort_alphanumeric(file_headers),
+                'header_comparison': tuple(header in file_headers_set for header in self.headers),
+                'rearrangement_needed': perm != tuple(range(len(file_headers))),
+                'perm': perm,
+                'dest_indices': tuple(header_positions[file_headers[position]] for position in perm),
             }
 
-    def get_data_generators(self) -> tuple[Iterator]:
+        self._rearrangement_needed = [
+            self.file_processing_data[file_name]['rearrangement_needed'] for file_name in self._file_names]
+        self._permutations = [self.file_processing_data[file_name]['perm'] for file_name in self._file_names]
+        self._dest_indices = [self.file_processing_data[file_name]['dest_indices'] for file_name in self._file_names]
+
+    def get_data_generators(self) -> list[Iterator]:
         """Obtain the data generators of each file.
 
         Returns
         -------
-        data_generators: tuple[Iterator]
+        data_generators: list[Iterator]
             The set of each data generator: 'read_record' fucntion.
 
         Notes
         -----
-        Stored in a tuple for later unpacking.
+        Stored in a list for later unpacking.
         """
-        data_generators: tuple[Iterator] = ()
+        data_generators: list[Iterator] = []
         factory: type[FileReaderFactory] = FileReaderFactory()
 
-        for file, headers in zip(self._file_names, self._headers_by_file):
-            data_by_record: int = len(headers) if '.json' in file else 0
+        for file in self._file_names:
             try:
                 file_reader = factory.get_file_reader(self._path, file)
             except ValueError as no_registered:
                 print(f'Error: {no_registered.args[0]}')
             else:
-                data_generator: Iterator[list] = file_reader.read_record(data_by_record)
-                data_generators = (*data_generators, data_generator)
+                data_generator: Iterator[list] = file_reader.read_record()
+                data_generators.append(data_generator)
         return data_generators
 
-    def process_data(self) -> tuple[bool, list[list]]:
+    def process_data(self) -> tuple[bool, Iterable[list]]:
         """Get the records/data, by means of the data generators,
 
         and rearrangment them when is needed. Finally sort all the
-        records based on first header (D1).
+        records based on the first headers (D1-D3).
 
         Returns
         -------
-        tuple(bool, list[list])
-            The first position is a flag to indicate if there was a
-            partial data write. The second is the records processed,
-            all of them or the last one if any writing has been done.
+        tuple(bool, Iterable[list])
+            The first position is a flag to indicate if some records
+            were saved in temporary files. The second is all the
+            records processed and sorted: a list or, if there are
+            temporary files, an iterator that merges them.
 
         Notes
         -----
-        Every time the records read exceed 50 thousand, it will be a
-        partial write to the output file (avoiding using too much RAM).
-        Then only the last read data will be returned.
+        Every time the records read exceed the memory budget
+        (buffer_limit), they are sorted and saved in a temporary file
+        (avoiding using too much RAM). At the end these sorted runs
+        and the last records read are merged (external merge sort), so
+        the output is sorted as a whole. The temporary files are
+        deleted once the merge is consumed.
         """
-        data_generators: tuple[Iterator] = self.get_data_generators()
+        data_generators: list[Iterator] = self.get_data_generators()
         self.make_file_processing_data()
         sorting: list[str] = []
-        partial_write: bool = False
+        run_files: list[BinaryIO] = []
+        buffer_bytes: int = 0  # Estimated memory used by the records read
+
+        for index, data_generator in enumerate(data_generators):
+            rearrangement_needed: bool = self._rearrangement_needed[index]
+            perm: tuple[int] = self._permutations[index]
+            for data in data_generator:
+                if rearrangement_needed:
+                    data = [data[position] for position in perm]
+                record: list[str | None] = self.complete_record(data, index)
+                sorting.append(record)
+                buffer_bytes += getsizeof(record) + sum(map(getsizeof, data))
+                if buffer_bytes > self.buffer_limit:
+                    print(
+                        f"{len(sorting)} records of {len(self._file_names)} files have been read.\n "
+                        "Please wait: saving them in a temporary file...")
+                    self.sort_records(sorting)
+                    run_files.append(self._save_run(sorting))
+                    sorting = []
+                    buffer_bytes = 0
+
+        self.sort_records(sorting)
+        if not run_files:
+            return False, sorting
+
+        return True, merge(*(self._read_run(run_file) for run_file in run_files), sorting, key=record_key)
+
+    def _save_run(self, records: list[list]) -> BinaryIO:
+        """Save the sorted records in a temporary file.
+
+        Parameters
+        ----------
+        records: list[list]
+            The sorted records to save.
+
+        Returns
+        -------
+        BinaryIO
+            The temporary file, positioned at its beginning. It is
+            deleted when closed.
+
+        Notes
+        -----
+        The records are pickled (by batches) to keep the type of the
+        data, so they are compared the same way during the merge.
+        """
+        run_file: BinaryIO = TemporaryFile(dir=self._path)
+        for start in range(0, len(records), self.run_batch_size):
+            dump(records[start:start + self.run_batch_size], run_file, protocol=HIGHEST_PROTOCOL)
+        run_file.seek(0)
+        return run_file
+
+    @staticmethod
+    def _read_run(run_file: BinaryIO) -> Iterator[list]:
+        """Read lazily the records saved in a temporary file.
+
+        Parameters
+        ----------
+        run_file: BinaryIO
+            The temporary file made by '_save_run'. It is closed, and so
+            deleted, after reading it.
 
-        generated_data: type[zip_longest] = zip_longest(*data_generators)
-        for data_tuple in generated_data:
-            if len(sorting) > 52000:  # Estimated to use approx 2Gb RAM with python 3.10 (memory-profiler)
-                # Write this data in the output file
-                file_writer: type[WriteData] = WriteData()
+        Returns
+        -------
+        Iterator[list]
+            Iterator with one record at a time.
+        """
+        with run_file:
+            while True:
                 try:
-                    sorting.sort(key=lambda data: data[0:3])
-                except TypeError:
-                    sorting.sort(key=lambda data: data[0])
-                print(
-                    f"52 thousand records of {len(self._file_names)}have been reading.\n "
-                    "Please wait: writing data in 'result' file...")
-                file_writer.write_data(sorting)
-                sorting = []
-                partial_write = True
-            for index, data in enumerate(data_tuple):
-                if data is not None:
-                    if self.file_processing_data[self._file_names[index]]['rearrangement_needed']:
-                        data = order_record(data, self._headers_by_file[index])
-                    data = self.complete_record(data, index)
-                    sorting.append(data)
-
-        # At this point it only sorts by the first three headers: D1-D3
-        try:
-            sorting.sort(key=lambda data: data[0:3])
-        except TypeError: # Only use D1 for sort
-            sorting.sort(key=lambda data: data[0])
+                    records: list[list] = load(run_file)
+                except EOFError:
+                    return
+                yield from records
+
+    @staticmethod
+    def sort_records(records: list[list]) -> None:
+        """Sort, in place, the records by the first three headers: D1-D3.
 
-        return partial_write, sorting
+        Parameters
+        ----------
+        records: list[list]
+            The completed records to sort.
+
+        Notes
+        -----
+        The sort key of each record ('record_key') is computed just
+        once, not by comparison. Missing data are sorted last, so the
+        records can always be compared.
+        """
+        records.sort(key=record_key)
 
     def complete_record(self, record: list[str], file_position: int) -> list[str | None]:
         """Check the record and complete it if needed to have the same
@@ -297,10 +440,9 @@ class ProcessData:
         The record must be ordered according the headers before try to
         complete it.
         """
-        record_completed: list[str | None] = []
-        file_name: str = self._file_names[file_position]
-        header_comparison: tuple[int] = self.file_processing_data[file_name]['header_comparison']
-        for data, is_header in zip_longest(record, header_comparison):
-            record_completed.append(data if is_header else None)
+        record_completed: list[str | None] = [None] * len(self.headers)
+        dest_indices: tuple[int] = self._dest_indices[file_position]
+        for dest_index, data in zip(dest_indices, record):
+            record_completed[dest_index] = data
 
         return record_completed
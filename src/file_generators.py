@@ -3,6 +3,8 @@
 Ideally, these files are generated after some data processing.
 """
 from abc import ABCMeta, abstractmethod
+from csv import QUOTE_NONE, writer
+from typing import TextIO
 
 
 class FileGenerator(metaclass=ABCMeta):
@@ -25,6 +27,8 @@ class FileGenerator(metaclass=ABCMeta):
         Path and name of the file to create.
     """
 
+    __slots__ = ('file',)
+
     @classmethod
     def __subclasshook__(cls, subclass) -> bool:
         """Define the conditions for a class to be a (virtual) subclass
@@ -84,6 +88,23 @@ class FileGenerator(metaclass=ABCMeta):
         Must be override in class that implements the interface.
         """
 
+    def close(self) -> None:
+        """Release the resources used to write the file.
+
+        Notes
+        -----
+        By default there is nothing to release; override it when the
+        file is kept open between calls.
+        """
+
+    def __enter__(self) -> 'FileGenerator':
+        """Use the generator as context manager, closing it at exit."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the file when the context ends."""
+        self.close()
+
 
 class FileGeneratorFactory:
     """Factory that permit register and select the proper format to
@@ -152,9 +173,42 @@ class YamlFileGenerator():  # FileGenerator
 
 
 class TSVFileGenerator(FileGenerator):
-    """Create TSV files writing its headers and data."""
+    """Create TSV files writing its headers and data.
+
+    Attributes
+    ----------
+    extension : str
+        Extension of the file including the dot at beginning.
+    buffer_size : int
+        Size in bytes of the buffer of the output file.
+    """
+
+    __slots__ = ('_file', '_writer')
 
     extension: str = '.tsv'
+    buffer_size: int = 1 << 20  # 1 MB
+
+    def __init__(self, directory: str, file_name: str, extension: str) -> None:
+        """Extend the functionality of interface. The file is kept open
+
+        (with its csv writer and a large buffer) between the writes of
+        headers and data, until 'close' is called.
+        """
+        super().__init__(directory, file_name, extension)
+        self._file: TextIO | None = None
+        self._writer = None
+
+    def _open(self, mode: str) -> None:
+        """Open the file and bind a tab separated csv writer to it.
+
+        Parameters
+        ----------
+        mode: str
+            Mode to open the file: 'w' to overwrite it, 'a' to append.
+        """
+        self._file = open(self.file, mode, buffering=self.buffer_size, encoding="utf-8", newline='')
+        self._writer = writer(self._file, delimiter='\t', lineterminator='\n', quoting=QUOTE_NONE, quotechar=None,
+                              escapechar='\\')
 
     def set_headers(self, headers: list[str]) -> None:
         """Open the file, and created if it does not exist, to
@@ -166,9 +220,9 @@ class TSVFileGenerator(FileGenerator):
         headers: list[str]
             Each position of the list is a metadada or header.
         """
-        with open(self.file, 'w', encoding="utf-8") as file:
-            file.write('\t'.join(headers))
-            file.write('\n')
+        self.close()
+        self._open('w')
+        self._writer.writerow(headers)
 
     def set_data(self, data: list[list]) -> None:
         """Write the ordered data in the output tsv file.
@@ -180,12 +234,22 @@ class TSVFileGenerator(FileGenerator):
         data: list[list]
             The list of ordered data to write. Each position of the list,
             other list, is a record/row of the file.
+
+        Notes
+        -----
+        The csv writer writes None values as empty strings. Tabs,
+        newlines and backslashes inside a data are escaped with a
+        backslash; quotes are written as they are.
+        If the headers were not written by this instance, the data is
+        appended to the existing file.
         """
-        with open(self.file, 'a', encoding="utf-8") as file:
-            num_records: int = len(data) - 1
-            for records_counter, line in enumerate(data):
-                for value in line:
-                    # if value is not None:
-                    file.write(f"{value if value is not None else ''}\t")
-                if records_counter < num_records:
-                    file.write('\n')
+        if self._file is None:
+            self._open('a')
+        self._writer.writerows(data)
+
+    def close(self) -> None:
+        """Close the file, if it is open."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
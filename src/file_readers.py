@@ -3,8 +3,10 @@ from abc import ABCMeta, abstractmethod
 from collections.abc import Iterator
 from csv import reader
 from os import stat
+from sys import intern
+from xml.etree.ElementTree import Element, XMLPullParser
 
-from ijson import kvitems, parse
+from ijson import items, parse
 
 
 class FileReader(metaclass=ABCMeta):
@@ -27,8 +29,14 @@ class FileReader(metaclass=ABCMeta):
         Reference of metadata of the files.
     size : float
         Size of the file in MB.
+    buffer_size : int
+        Size in bytes of the buffer used to read the file.
     """
 
+    __slots__ = ('file_name', 'path', 'headers', 'size')
+
+    buffer_size: int = 1 << 20  # 1 MB
+
     @classmethod
     def __subclasshook__(cls, subclass) -> bool:
         """Define the conditions for a class to be a (virtual) subclass
@@ -70,6 +78,8 @@ class FileReader(metaclass=ABCMeta):
         Notes
         -----
         Must be override in class that implements the interface.
+        The headers should be interned (sys.intern): they are repeated
+        in many files, so they are stored once and compared by identity.
         """
         raise NotImplementedError()
 
@@ -161,6 +171,8 @@ class CSVFileReader(FileReader):
         Extension of the file including the dot at beginning.
     """
 
+    __slots__ = ()
+
     extension: str = '.csv'
 
     def get_headers(self) -> None:
@@ -168,9 +180,8 @@ class CSVFileReader(FileReader):
 
         First raw of data.
         """
-        with open(f'{self.path}{self.file_name}', encoding="utf-8") as file:
-            line: str = file.readline().rstrip('\n')
-            self.headers = line.split(',')
+        with open(f'{self.path}{self.file_name}', encoding="utf-8", newline='') as file:
+            self.headers = [intern(header) for header in next(reader(file), [])]
 
     def read_record(self, data_by_record: int = 0) -> Iterator[list]:
         """Read records lazily: line by line to yield it.
@@ -186,11 +197,16 @@ class CSVFileReader(FileReader):
         Iterator
             Iterator with a list related to one data of the file
             at a time.
+
+        Notes
+        -----
+        The file is read in big blocks (buffer_size) and parsed by the
+        C implementation of the csv module.
         """
-        with open(f'{self.path}{self.file_name}', encoding="utf-8", newline='') as file:
-            next(file)
-            for line in reader(file):
-                yield line
+        with open(f'{self.path}{self.file_name}', buffering=self.buffer_size, encoding="utf-8", newline='') as file:
+            records: Iterator[list] = reader(file)
+            next(records, None)  # Skip the headers
+            yield from records
 
 
 class JSONFileReader(FileReader):
@@ -202,6 +218,8 @@ class JSONFileReader(FileReader):
         Extension of the file including the dot at beginning.
     """
 
+    __slots__ = ()
+
     extension: str = '.json'
 
     def get_headers(self) -> None:
@@ -231,38 +249,38 @@ class JSONFileReader(FileReader):
             # Value: the name of the property or the value of it
             for prefix, event, value in parser:
                 if begin_headers and event == 'map_key':
-                    self.headers.append(value)
+                    self.headers.append(intern(value))
                 elif begin_headers and event == 'end_map':
                     break
                 elif (prefix, event) == ('fields.item', 'start_map'):
                     begin_headers = True
 
     def read_record(self, data_by_record: int = 0) -> Iterator[list]:
-        """Read JSON object by object, thanks to knowing how much data
+        """Read JSON object by object, thanks to knowing the JSON
 
-        there is per object and the JSON structure.
+        structure: every object of the array 'fields' is a record.
         Ijson is essential to achieve the above.
 
         Parameters
         ----------
         data_by_record: int
-            Number of data by record.
+            Number of data by record. It isn't used in this
+            implementation.
 
         Returns
         -------
         Iterator
             Iterator with a list related to one data of the file
             at a time.
-        """
-        raw_data: list[str] = []
 
+        Notes
+        -----
+        Whole objects are built by ijson, which is much faster than
+        handling the key-value pairs one by one in python.
+        """
         with open(f'{self.path}{self.file_name}', 'rb') as file:
-            items_kv: Iterator = kvitems(file, 'fields.item', buf_size=512)  # Just read 512 b for time
-            for _, value in items_kv:
-                raw_data.append(value)
-                if len(raw_data) == data_by_record:
-                    yield raw_data
-                    raw_data = []
+            for record in items(file, 'fields.item', buf_size=self.buffer_size):
+                yield list(record.values())
 
 
 class XMLFileReader(FileReader):
@@ -285,6 +303,8 @@ class XMLFileReader(FileReader):
         Extension of the file including the dot at beginning.
     """
 
+    __slots__ = ('_parent', '_element', '_attribute', '_value')
+
     extension: str = '.xml'
 
     def __init__(self, path: str, file_name: str, parent_tag: str = 'objects', element_tag: str = 'object',
@@ -299,6 +319,39 @@ class XMLFileReader(FileReader):
         self._attribute: str = attribute_tag
         self._value: str = value_tag
 
+    @staticmethod
+    def _iter_elements(xml_path: str, chunk_size: int) -> Iterator[type[Element]]:
+        """Parse the xml file, in binary mode and by chunks, to yield
+
+        every element once its end tag has been read.
+
+        Parameters
+        ----------
+        xml_path : str
+            Path of the xml file.
+        chunk_size : int
+            Number of bytes read from the file and fed to the parser
+            at a time.
+
+        Returns
+        -------
+        Iterator[type[Element]]
+            Iterator with one complete element at a time.
+
+        Notes
+        -----
+        The bytes are decoded by the C parser (expat), not in python.
+        """
+        parser: type[XMLPullParser] = XMLPullParser(events=('end',))
+        with open(xml_path, 'rb', buffering=0) as file:
+            while chunk := file.read(chunk_size):
+                parser.feed(chunk)
+                for _, element in parser.read_events():
+                    yield element
+        parser.close()
+        for _, element in parser.read_events():
+            yield element
+
     def _read_xml_file_attributes(self, xml_path):
         """Read the xml file to capture the metadata of the tags
 
@@ -310,16 +363,11 @@ class XMLFileReader(FileReader):
             Path of the xml file.
         """
         captured_names: list = []
-        end_parent = f'</{self._parent}>'
-        start_tag: str = f'<{self._element}'
-        with open(xml_path, encoding="utf-8") as file:
-            for line in file:
-                if start_tag in line and self._attribute in line:
-                    position: int = line.rfind('=') + 2  # avoid the characters ="
-                    name: str = line[position:-3]
-                    captured_names.append(name)
-                elif end_parent in line:
-                    break
+        for element in self._iter_elements(xml_path, 2048):  # Just read 2k at a time
+            if element.tag == self._element:
+                captured_names.append(intern(element.get(self._attribute, '')))
+            elif element.tag == self._parent:
+                break
         return captured_names
 
     def get_headers(self) -> None:
@@ -349,29 +397,12 @@ class XMLFileReader(FileReader):
 
         Notes
         -----
-        This implementation to get the data is based on the fact that
-        the XML file is a well-formed document. Otherwise the algorithm
-        could fail and must be refactored -using commented variables-.
+        The file is parsed by events with the C parser of ElementTree,
+        so the XML file must be a well-formed document. Every parent
+        element is cleared once its data is yielded, to keep the memory
+        used flat.
         """
-        start_data: bool = False
-        captured_records: list = []
-        # start_tag_identified: bool = False
-
-        start_parent: str = f'<{self._parent}'
-        end_parent: str = f'</{self._parent}'
-        value_tag: str = f'<{self._value}>'
-
-        with open(f'{self.path}{self.file_name}', encoding="utf-8") as file:
-            next(file)
-            for line in file:
-                if start_parent in line:
-                    start_data = True
-                    continue
-                if start_data and value_tag in line:
-                    position: int = line.find('>') + 1
-                    captured_records.append(line[position])
-                    continue
-                if end_parent in line:
-                    start_data = False
-                    yield captured_records
-                    captured_records = []
+        for element in self._iter_elements(f'{self.path}{self.file_name}', self.buffer_size):
+            if element.tag == self._parent:
+                yield [value.text for value in element.iter(self._value)]
+                element.clear()
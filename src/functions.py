@@ -1,34 +1,18 @@
 """General functions for the application."""
+from collections import OrderedDict
 from collections.abc import Callable
-from glob import glob
+from functools import lru_cache
 import os
 import re
 
 from menu_functions import select_directory
 
+# Files found by directory (the last 16 ones): {path: (mtime, files)}
+_DIR_CACHE: OrderedDict[str, tuple[int, tuple]] = OrderedDict()
+_DIR_CACHE_SIZE: int = 16
 
-def clean_file_path(path: str, list_files: list[str]) -> list[str]:
-    """From every file of the list, delete the part of the path to only
 
-    keep the file name (and its extension/format).
-
-    Parameters
-    ----------
-    path: str
-        The path to the directory. The string to be removed from the
-        files.
-    list_files: list
-        The list of files to clean.
-
-    Returns
-    -------
-    list
-        The list of files cleaned.
-    """
-    return [file.replace(f'{path}', '') for file in list_files]
-
-
-def are_there_files(list_csv: list, list_json: list, list_xml: list, path: str) -> tuple:
+def are_there_files(list_csv: list, list_json: list, list_xml: list) -> tuple:
     """Verify if there are files in the list.
 
     If there is at least one, add the list to the tuple to be returned;
@@ -37,25 +21,26 @@ def are_there_files(list_csv: list, list_json: list, list_xml: list, path: str)
     Parameters
     ----------
     list_csv : list
-        List of .csv files (it could be empty).
+        List of names of .csv files (it could be empty).
     list_json: list
-        List of .json files (it could be empty).
+        List of names of .json files (it could be empty).
     list_xml: list
-        List of .xml files (it could be empty).
-    path: str
-        The path of the directory where the files are located.
+        List of names of .xml files (it could be empty).
 
     Returns
     -------
     files: tuple
         The tuple with the lists of found files .
     """
-    files: tuple = ()
-    files = (*files, clean_file_path(path, list_csv)) if len(list_csv) > 0 else files
-    files = (*files, clean_file_path(path, list_json)) if len(list_json) > 0 else files
-    files = (*files, clean_file_path(path, list_xml)) if len(list_xml) > 0 else files
+    files: list[list] = []
+    if list_csv:
+        files.append(list_csv)
+    if list_json:
+        files.append(list_json)
+    if list_xml:
+        files.append(list_xml)
 
-    return files
+    return tuple(files)
 
 
 def get_files(directory_path: str) -> tuple:
@@ -72,12 +57,69 @@ def get_files(directory_path: str) -> tuple:
         It might contains list of files according the extension.
         The first list are .csv files, the second list are .json files
         and the third one is the related to .xml files.
+
+    Notes
+    -----
+    The directory is scanned just once. Like a glob pattern, the
+    hidden files are skipped and the extensions are case sensitive; and
+    if the directory can't be read (e.g. it doesn't exist) no files are
+    found.
     """
-    files_csv: list = glob(f'{directory_path}*.csv')
-    files_json: list = glob(f'{directory_path}*.json')
-    files_xml: list = glob(f'{directory_path}*.xml')
+    files_by_extension: dict[str, list[str]] = {'csv': [], 'json': [], 'xml': []}
+    extensions: tuple[str] = tuple(f'.{extension}' for extension in files_by_extension)
+
+    try:
+        with os.scandir(directory_path) as entries:
+            for entry in entries:
+                name: str = entry.name
+                # The name is checked first: it may save the 'stat' of is_file
+                if name.startswith('.') or not name.endswith(extensions) or not entry.is_file():
+                    continue
+                files_by_extension[name.rpartition('.')[2]].append(name)
+    except OSError:  # Not found, not a directory, without permission...
+        return ()
+
+    return are_there_files(files_by_extension['csv'], files_by_extension['json'], files_by_extension['xml'])
 
-    return are_there_files(files_csv, files_json, files_xml, directory_path)
+
+def get_cached_files(directory_path: str) -> tuple:
+    """Retrieve the files -of interest- in the directory, reusing the
+
+    result of a previous search when the directory hasn't changed.
+
+    Parameters
+    ----------
+    directory_path : str
+        The path to the directory where the files are located.
+
+    Returns
+    -------
+    tuple
+        The same as 'get_files'.
+
+    Notes
+    -----
+    The modification time of the directory changes when a file is
+    added, removed or renamed in it; so one 'stat' call is enough to
+    know if the directory must be scanned again.
+    A directory that can't be read has no files (and isn't cached).
+    """
+    key: str = os.path.abspath(directory_path)
+    try:
+        mtime: int = os.stat(directory_path).st_mtime_ns
+    except OSError:  # Not found, without permission...: there are no files
+        return ()
+    cached: tuple[int, tuple] | None = _DIR_CACHE.get(key)
+    if cached is not None and cached[0] == mtime:
+        _DIR_CACHE.move_to_end(key)
+        return cached[1]
+
+    files: tuple = get_files(directory_path)
+    _DIR_CACHE[key] = (mtime, files)
+    _DIR_CACHE.move_to_end(key)
+    if len(_DIR_CACHE) > _DIR_CACHE_SIZE:
+        _DIR_CACHE.popitem(last=False)
+    return files
 
 
 def get_files_from_dir() -> tuple[str, tuple]:
@@ -92,7 +134,7 @@ def get_files_from_dir() -> tuple[str, tuple]:
         list of files.
     """
     path: str = select_directory()
-    files: tuple = get_files(path)
+    files: tuple = get_cached_files(path)
     # print(f'{path=}\n{files=}')
     if len(files) == 0:
         return path, None
@@ -109,14 +151,37 @@ def create_result_directory(directory: str) -> None:
     directory: str
         The path, which include the name of it, of the result directory.
     """
-    if not os.path.exists(directory):
-        try:
-            os.mkdir(directory)
-        except FileExistsError as file_error:
-            print(f'{file_error.args[0]}')
+    os.makedirs(directory, exist_ok=True)
+
+
+# Split a string in runs of digits and non-digits (the digits are kept)
+_split_numbers: Callable[[str], list[str]] = re.compile('([0-9]+)').split
+
+
+def _alphanum_key(string: str) -> tuple[tuple[str | int, ...], str]:
+    """Return the key to sort a string in alphanumeric order.
+
+    Parameters
+    ----------
+    string: str
+        The string to convert in a key.
 
+    Returns
+    -------
+    tuple[tuple[str | int, ...], str]
+        The runs of non-digits (in upper case) and digits (as int) of
+        the string; and the string itself, to sort the strings with
+        the same runs (e.g. 'M1' and 'm1') always in the same way.
 
-convert: Callable[[str | int], str | int] = (lambda element: int(element) if element.isdigit() else element.upper())
+    Notes
+    -----
+    Splitting by a captured group alternates the runs: the even
+    positions are non-digits (maybe empty) and the odd ones digits. So
+    the kind of each run is known by its position, without checking it.
+    """
+    return (
+        tuple(int(run) if position & 1 else run.upper() for position, run in enumerate(_split_numbers(string))),
+        string)
 
 
 def sort_alphanumeric(strings: list[str], descending: bool = False) -> list[str]:
@@ -149,9 +214,67 @@ def sort_alphanumeric(strings: list[str], descending: bool = False) -> list[str]
     https://stackoverflow.com/questions/2669059/how-to-sort-alpha-
     numeric-set-in-python
     """
-    alphanum_key: Callable[[str], list[str]] = lambda data: [convert(header) for header in re.split('([0-9]+)', data)]
+    return sorted(strings, key=_alphanum_key, reverse=descending)
+
+
+def is_sorted_alphanumeric(strings: list[str]) -> bool:
+    """Check if a set of strings is already in alphanumeric order.
+
+    Parameters
+    ----------
+    strings: list[str]
+        The strings to check.
+
+    Returns
+    -------
+    bool
+        True if the strings are in ascending alphanumeric order (as
+        'sort_alphanumeric' would leave them), False otherwise.
+
+    Notes
+    -----
+    It is linear and stops at the first unordered string, so it is
+    cheaper than sorting the strings to compare them.
+    """
+    previous_key: tuple | None = None
+    for string in strings:
+        key: tuple = _alphanum_key(string)
+        if previous_key is not None and key < previous_key:
+            return False
+        previous_key = key
+    return True
 
-    return sorted(strings, key=alphanum_key, reverse=descending)
+
+@lru_cache(maxsize=64)
+def _alphanumeric_permutation(strings: tuple[str]) -> tuple[int]:
+    """Cached implementation of 'compute_alnum_permutation'."""
+    if is_sorted_alphanumeric(strings):
+        return tuple(range(len(strings)))
+    # Sort the positions (argsort) by the keys of the strings
+    keys: list[tuple] = [_alphanum_key(string) for string in strings]
+    return tuple(sorted(range(len(strings)), key=keys.__getitem__))
+
+
+def compute_alnum_permutation(strings: list[str]) -> tuple[int]:
+    """Get the positions of the strings in alphanumeric order.
+
+    Parameters
+    ----------
+    strings: list[str]
+        The strings to sort, e.g. the headers of a file.
+
+    Returns
+    -------
+    tuple[int]
+        The position of each string, in the order that
+        'sort_alphanumeric' would leave them.
+
+    Notes
+    -----
+    The result is cached by the strings (the last 64 sets), since the
+    same headers are used to order every record of a file.
+    """
+    return _alphanumeric_permutation(tuple(strings))
 
 
 def order_record(record: list[str], messy_file_headers: list[str]) -> list[str]:
@@ -172,9 +295,12 @@ def order_record(record: list[str], messy_file_headers: list[str]) -> list[str]:
     -------
     ordered_record: list[str]
         The record ordered according the headers.
-    """
-    couple = list(zip(messy_file_headers, record))
-    couple.sort(key=lambda data: [convert(header_char) for header_char in re.split('([0-9]+)', data[0])])
-    _, ordered_record = zip(*couple)
 
-    return list(ordered_record)
+    Notes
+    -----
+    The headers are sorted just once (see 'compute_alnum_permutation'),
+    then the record is only rearranged.
+    It is kept as a public helper to order a single record; ProcessData
+    applies the permutation of each file directly instead.
+    """
+    return [record[position] for position in compute_alnum_permutation(messy_file_headers)]
@@ -26,9 +26,12 @@ variables. Following the PEP 483, 484, 526...
 The format of docstrings is NumPy/SciPy, following PEP 257.
 """
 from functions import get_files_from_dir
-from menu_functions import exit, clear_screen, get_option_user, show_menu
+from menu_functions import exit, clear_screen, get_option_user, prompt_yes, show_menu
 from data_clients import ProcessData, WriteData
 
+# Instances of the "client" classes by directory, reused when it's processed again
+_PROC_CACHE: dict[str, tuple[ProcessData, WriteData]] = {}
+
 
 def process_headers(processing: type[ProcessData], file_writer: type[WriteData], files: tuple) -> None:
     """Take the headers of all the files, sort them and write them in
@@ -68,12 +71,16 @@ def process_data(path: str, files: tuple) -> None:
         The tuple of file lists to process.
     """
     # Instance of the "client" classes that make the main work.
-    processing: type[ProcessData] = ProcessData(path)
-    file_writer: type[WriteData] = WriteData(path)
+    clients: tuple[ProcessData, WriteData] | None = _PROC_CACHE.get(path)
+    if clients is None:
+        clients = _PROC_CACHE[path] = (ProcessData(path), WriteData(path))
+    processing, file_writer = clients
+    processing.reset()
 
-    process_headers(processing, file_writer, files)
-    partial_write, sorted_data = processing.process_data()
-    file_writer.write_data(sorted_data)
+    with file_writer:
+        process_headers(processing, file_writer, files)
+        partial_write, sorted_data = processing.process_data()
+        file_writer.write_data(sorted_data)
 
     print(f"\nThe data have been sorted and written in '{file_writer}'.")
 
@@ -82,10 +89,6 @@ def main():
     """Display the menu and call the functions to process the data."""
     path: str = ''
     data_files: None | tuple = None
-    options: dict[int, callable] = {
-        1: get_files_from_dir,
-        2: process_data,
-    }
 
     while True:
         clear_screen()
@@ -94,23 +97,20 @@ def main():
 
         clear_screen()
         if selected_option == 1:
-            path, data_files = options[selected_option]()
+            path, data_files = get_files_from_dir()
             if data_files is None:
                 print(f"There is no files with extension .csv, .json or .xml in '{path}'.")
             else:
-                continue_process_data: str = input(
-                    '\nContinue with the process of sorting? (y/n: another key): ').lower().strip()
-                if continue_process_data == 'y':
-                    options[2](path, data_files)
+                if prompt_yes('\nContinue with the process of sorting? (y/n: another key): '):
+                    process_data(path, data_files)
         elif selected_option == 2 and data_files is None:
             print('\nYou must select the directory first.')
         elif selected_option == 2:
-            options[2](path, data_files)
+            process_data(path, data_files)
         elif selected_option == 3:
             exit()
         # After execute the opttion, show:
-        to_continue: str = input("\nDo you want to return to the menu? (y/n: another key): ").lower().strip()
-        if to_continue == 'y':
+        if prompt_yes("\nDo you want to return to the menu? (y/n: another key): "):
             continue
         exit()
 
@@ -3,8 +3,12 @@
 interact with the application.
 """
 from os import system, name
+import re
 from typing import NoReturn
 
+# Any of the path separators: slash or backslash
+_path_separator: re.Pattern = re.compile(r'[/\\]')
+
 
 def clear_screen() -> None:
     """To clear screen terminal indepently of Operating system."""
@@ -17,6 +21,24 @@ def exit() -> NoReturn:
     raise SystemExit  # Exactly the same to write system.exit
 
 
+def prompt_yes(message: str) -> bool:
+    """Ask a yes/no question to the user.
+
+    Parameters
+    ----------
+    message: str
+        The question to show.
+
+    Returns
+    -------
+    bool
+        True if the user answered 'y' (or 'Y'), False for any other
+        answer.
+    """
+    answer: str = input(message).strip()
+    return answer == 'y' or answer == 'Y'
+
+
 def show_menu() -> None:
     """Show the menu of the application."""
     print('\n\t\t-Sorting Data of Files-\n')
@@ -58,16 +80,14 @@ def select_directory() -> str:
         The string of the entered directory.
     """
     while True:
-        use_path: str = input("Do you want to use the files in 'data' directory? (y/n: another key): ").lower().strip()
-        if use_path == 'y':
+        if prompt_yes("Do you want to use the files in 'data' directory? (y/n: another key): "):
             return '../data/'
 
         print('\n* NOTE: Please make sure of write the absolute path to the directory.')
         directory_path: str = input("Enter the path to the data files (to sort): ").strip()
-        if '/' not in directory_path and '\\' not in directory_path:
+        if _path_separator.search(directory_path) is None:
             print('\n* ERROR: The path is not valid.')
-            retry: str = input('Do you want to try again? (y/n: another key): ').lower().strip()
-            if retry == 'y':
+            if prompt_yes('Do you want to try again? (y/n: another key): '):
                 continue
             exit()
         if not directory_path.endswith('/'):
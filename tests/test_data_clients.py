@@ -0,0 +1,51 @@
+"""Checks of the data processing with the client classes."""
+import os
+import sys
+from tempfile import TemporaryDirectory
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from data_clients import ProcessData, record_key  # noqa: E402
+import main  # noqa: E402
+
+
+class TestMergeOfSortedRuns(unittest.TestCase):
+    """Records saved in temporary files (sorted runs) are merged."""
+
+    def test_tiny_buffer_limit_with_mixed_headers(self) -> None:
+        """Files without some of D1-D3 can be merged (None vs str)."""
+        with TemporaryDirectory() as directory:
+            path: str = f'{directory}/'
+            with open(f'{path}a.csv', 'w', encoding='utf-8') as file:
+                file.write('D1,D2,D3,M1\nx,y,z,1\nx,y,a,2\n')
+            with open(f'{path}b.csv', 'w', encoding='utf-8') as file:
+                file.write('D1,D2,M1\nx,y,3\nw,y,4\n')
+
+            original_limit: int = ProcessData.buffer_limit
+            ProcessData.buffer_limit = 1  # Every record is a sorted run
+            try:
+                main.process_data(path, (['a.csv', 'b.csv'],))
+            finally:
+                ProcessData.buffer_limit = original_limit
+
+            with open(f'{path}result/result.tsv', encoding='utf-8') as file:
+                lines: list[str] = file.read().splitlines()
+
+        self.assertEqual(lines, [
+            'D1\tD2\tD3\tM1',
+            'w\ty\t\t4',
+            'x\ty\ta\t2',
+            'x\ty\tz\t1',
+            'x\ty\t\t3',
+        ])
+
+    def test_record_key_is_a_total_order(self) -> None:
+        """Text, numbers and missing data can be sorted together."""
+        records: list[list] = [['b', None, 1], [None, 'a', 'a'], [2, 'a', 'a'], ['b', 'a', None], ['a', 'a', 'a']]
+        self.assertEqual(sorted(records, key=record_key), [
+            [2, 'a', 'a'], ['a', 'a', 'a'], ['b', 'a', None], ['b', None, 1], [None, 'a', 'a']])
+
+
+if __name__ == '__main__':
+    unittest.main()